@@ -1,24 +1,118 @@
 import types
 import heapq
 import random
-from collections import Counter
-
-from utils import get_funcs, get_types
+import inspect
+import functools
+import threading
+from array import array
+from collections import Counter, deque
+from typing import Callable, NamedTuple
+
+from utils import get_funcs, get_types, precompute_types
 from utils import softmax, argmax
 from utils import SINK_KWD, OUT_KWD
 from generators import DTYPE_GENERATORS
 
+@functools.lru_cache(maxsize=None)
+def _positional_names(func: types.FunctionType) -> tuple[str]:
+    """
+    Names of the parameters of `func` that can be passed positionally, in order.
+    """
+    return tuple(
+        p.name for p in inspect.signature(func).parameters.values()
+        if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _import_numba() -> types.ModuleType | None:
+    """
+    The numba module, imported on first use since only `numba_compile` needs
+    it, or None if numba is not installed; graphs then run as plain Python.
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba
+
+
+@functools.lru_cache(maxsize=None)
+def _jitted(func: Callable) -> Callable:
+    """
+    `func` wrapped with `numba.njit`, unless it is a numba dispatcher already,
+    memoized so that every graph shares one dispatcher per function. Nothing
+    is compiled until a jitted graph calls it, and the machine code is cached
+    on disk where `func` has a source file.
+    """
+    numba = _import_numba()
+    if isinstance(func, numba.core.dispatcher.Dispatcher):
+        return func
+    try:
+        return numba.njit(func, cache=True)
+    except RuntimeError:    # no source file to cache against, e.g. defined by `exec`
+        return numba.njit(func)
+
+
+def _type_mask(vec: list[int]) -> int | None:
+    """
+    Pack a dense vector of type multiplicities into a bitmask, with bit `i`
+    set if type `i` is present, or return None if some type occurs more than
+    once.
+    """
+    mask = 0
+    for i, count in enumerate(vec):
+        if count > 1:
+            return None
+        if count:
+            mask |= 1 << i
+    return mask
+
+
+def _call_by_keyword(func, kwds: tuple[str], *args):
+    """
+    Call `func` with positional `args` passed as the keywords `kwds` instead.
+    """
+    return func(**dict(zip(kwds, args)))
+
+
+class _TupleWrap:
+    """
+    Call `func` and wrap its single return value in a one-element tuple. A
+    class rather than a closure, so that vertices holding it stay picklable.
+    """
+    __slots__ = ('func',)
+
+    def __init__(self, func: Callable):
+        self.func = func
+
+    def __call__(self, *args, **kwargs) -> tuple:
+        return (self.func(*args, **kwargs),)    # comma important: converts to tuple
+
 
 class Vertex:
+    __slots__ = ('name', 'inp_names', 'inp_types', 'out_type')
+
     name: str
-    inp_type: dict[str, type]
+    inp_names: tuple[str]
+    inp_types: tuple[type]
     out_type: tuple[type]
 
+    @property
+    def inp_type(self) -> dict[str, type]:
+        """
+        The input types as a `{keyword: type}` dictionary, built from the
+        parallel `inp_names` and `inp_types` tuples.
+        """
+        return dict(zip(self.inp_names, self.inp_types))
+
     def __lt__(self, other):
         return len(self) < len(other)
 
 
 class FuncVertex(Vertex):
+    __slots__ = ('func', 'single', '_invoke')
+
     def __init__(self, name: str, func: types.FunctionType):
         """
         Create a new function vertex.
@@ -32,28 +126,36 @@ class FuncVertex(Vertex):
         """
         self.name = name
         self.func = func
-        ( self.inp_type,
+        ( inp_type,
           self.out_type,
           self.single    ) = get_types(func)
+        self.inp_names = tuple(inp_type)
+        self.inp_types = tuple(inp_type.values())
+        # numba dispatchers are slow to call from Python, so plain calls go
+        # to the original function; only whole-graph compilation uses `func`
+        func = getattr(func, 'py_func', func)
+        if self.single:
+            self._invoke = _TupleWrap(func)
+        else:
+            self._invoke = func
     
     def __len__(self) -> int:
         return len(self.out_type)
 
     def __str__(self) -> str:
-        return f'{self.name}({", ".join(k for k in self.inp_type)})'
+        return f'{self.name}({", ".join(self.inp_names)})'
     
     def __repr__(self) -> str:
-        _i = ", ".join(f"{k}: {t}" for k, t in self.inp_type.items())
+        _i = ", ".join(f"{k}: {t}" for k, t in zip(self.inp_names, self.inp_types))
         return f'{self.name}({_i}) -> {self.out_type}'
     
     def __call__(self, *args, **kwargs) -> tuple:
-        result = self.func(*args, **kwargs)
-        if self.single:
-            return (result,)                    # comma important: converts to tuple
-        return result
+        return self._invoke(*args, **kwargs)
 
 
 class ConstVertex(Vertex):
+    __slots__ = ('value',)
+
     def __init__(self, value):
         """
         Initialize a constant vertex with a given value.
@@ -67,7 +169,8 @@ class ConstVertex(Vertex):
         """
         self.name = str(value)
         self.value = value
-        self.inp_type = {}
+        self.inp_names = ()
+        self.inp_types = ()
         self.out_type = type(value)
     
     def __len__(self) -> int:
@@ -84,6 +187,8 @@ class ConstVertex(Vertex):
 
 
 class SinkVertex(Vertex):
+    __slots__ = ()
+
     def __init__(self, dtype: type):
         """
         Initialize a sink vertex with a given type to discard useless outputs.
@@ -94,7 +199,8 @@ class SinkVertex(Vertex):
             The type of the output to be discarded.
         """
         self.name = SINK_KWD
-        self.inp_type = {SINK_KWD: dtype}
+        self.inp_names = (SINK_KWD,)
+        self.inp_types = (dtype,)
         self.out_type = type(None)
     
     def __len__(self) -> int:
@@ -111,9 +217,12 @@ class SinkVertex(Vertex):
 
 
 class OutVertex(Vertex):
+    __slots__ = ()
+
     def __init__(self, dtype: type):
         self.name = "~ret"
-        self.inp_type = {OUT_KWD: dtype}
+        self.inp_names = (OUT_KWD,)
+        self.inp_types = (dtype,)
         self.out_type = (dtype,)                    # comma important: converts to tuple
     
     def __len__(self) -> int:
@@ -131,6 +240,21 @@ class OutVertex(Vertex):
         return (kwargs[OUT_KWD],)                   # comma important: converts to tuple
 
 
+class _Compiled(NamedTuple):
+    """
+    Structural analysis of a `FuncGraph`, cached until the graph is mutated.
+    """
+    order: list[Vertex]                         # non-sink vertices in topological order
+    inp_type: dict[str, type]                   # argument name: type
+    arg_map: dict[tuple[Vertex, str], str]      # (vertex, kwd): argument name
+    out_type: tuple[type]
+    out_map: tuple[tuple[Vertex, int]]          # (vertex, output idx) per graph output
+    first_slot: dict[Vertex, int]               # vertex: slot of its output 0
+    n_slots: int                                # number of arguments plus vertex outputs
+    out_slots: tuple[int]                       # slot per graph output
+    plan: tuple[tuple[Vertex, Callable, tuple[int], int, int]]  # (vertex, callable, input slots, first slot, end slot)
+
+
 class FuncGraph:
     """
     An object to compose functions as a graph and execute it.
@@ -140,11 +264,13 @@ class FuncGraph:
     name
         The name of this function graph.
     vertices
-        A set of `Vertex` objects.
+        A list of `Vertex` objects, in insertion order; a vertex's position is
+            also its interned id.
     adjacency
         A dictionary mapping from `Vertex` to a list of lists, where
             the outer list is indxed by output index, and each inner list contains 
-            `(target_vertex, keyword)` pairs.
+            `(target_vertex, keyword)` pairs (or None for unconnected outputs).
+            This is a read-only view rebuilt from the flat edge arrays.
     argdeps
         A dictionary mapping from `Vertex` to an inner dictionary, mapping
             from keyword to `(source_vertex, output_idx)`.
@@ -152,16 +278,28 @@ class FuncGraph:
         A tuple of types to order the arguments by.
     output_order
         A tuple of types to order the outputs by.
+    codegen
+        Whether calls go through a generated straight-line Python function
+        (True) or through the generic graph interpreter (False).
+    numba_compile
+        Whether the generated function is additionally compiled with
+        `numba.njit` when every vertex allows it. Compiled graphs compute
+        with numba's fixed-width types, so their results can differ from
+        plain Python.
     """
 
     name: str
-    vertices: set[Vertex]
-    adjacency: dict[Vertex, list[type[None] | list[tuple[Vertex, str]]]]
+    vertices: list[Vertex]
     argdeps: dict[Vertex, dict[str, tuple[Vertex, int]]]
-    input_order: tuple[type]
-    output_order: tuple[type]
+    codegen: bool
+    numba_compile: bool
 
-    def __init__(self, name: str = 'compositeFn'):
+    def __init__(
+        self,
+        name: str = 'compositeFn',
+        codegen: bool = True,
+        numba_compile: bool = False
+    ):
         """
         Initialize an empty function graph.
 
@@ -169,24 +307,109 @@ class FuncGraph:
         ----------
         name
             The name of this function graph.
+        codegen
+            Whether to compile the graph into a straight-line Python function
+            on first call, instead of interpreting it on every call.
+        numba_compile
+            Whether to compile the generated function, and the functions of
+            its vertices, with `numba.njit`. This only happens if numba is
+            installed and every input and output type of the graph has a
+            numba equivalent, and numba manages to type every function;
+            otherwise the plain Python function is used. Off by default, as
+            compiling a graph costs far more than calling it a handful of
+            times, and as compiled graphs follow numba's semantics rather
+            than Python's: ints are 64-bit and wrap on overflow, the square
+            root or fractional power of a negative float is nan rather than
+            complex, and float division by zero or truncation of nan do not
+            raise.
 
         Notes
         -----
-        `vertices` is a set of `Vertex` objects.
-        `adjacency` is a dictionary mapping from `Vertex` to a list of lists, where
-            the outer list is indxed by output index, and each inner list contains 
-            `(target_vertex, keyword)` pairs.
+        `vertices` is a list of `Vertex` objects, in insertion order; `_vid`
+            maps each vertex back to its position for O(1) membership tests.
+        Edges are stored as parallel arrays over interned vertex ids: the i-th
+            edge runs from output `_edge_src_idx[i]` of vertex `_edge_src[i]`
+            to keyword `_edge_kwd[i]` of vertex `_edge_dst[i]`.
+        `_out_count` holds the number of edges leaving each output of each
+            vertex, where the outputs of a vertex start at `_out_base[vid]`;
+            `_open_outs` counts the outputs of each vertex with no edges.
+        `_ord` is a topological index per vid, kept valid on every `feed` with
+            Pearce and Kelly's online algorithm; `_succ` lists the successor
+            vids of each vertex for that purpose.
         `argdeps` is a dictionary mapping from `Vertex` to an inner dictionary, mapping
             from keyword to `(source_vertex, output_idx)`.
         `input_order` is a tuple of types to order the arguments by.
         `output_order` is a tuple of types to order the outputs by.
         """
         self.name = name
-        self.vertices = set()
-        self.adjacency = {}     # adjacency dict, with list elements; vertex: [out_idx: [(vertex, kwd)]]
+        self.vertices = []
+        self._vid = {}                  # vertex: interned integer id (index into `vertices`)
+        self._edge_src = array('i')     # edge: source vid
+        self._edge_src_idx = array('i') # edge: source output index
+        self._edge_dst = array('i')     # edge: destination vid
+        self._edge_kwd = []             # edge: destination keyword
+        self._out_base = array('i')     # vid: index of its first output in `_out_count`
+        self._out_count = array('i')    # output slot: number of outgoing edges
+        self._open_outs = array('i')    # vid: number of outputs without any outgoing edge
+        self._succ = []                 # vid: successor vids, one per edge
+        self._ord = array('i')          # vid: position in a valid topological order
         self.argdeps = {}       # reverse adjacency, but with dictionary elements; vertex: {kwd: (vertex, out_idx)}
-        self.input_order = None
-        self.output_order = None
+        self._input_order = None
+        self._output_order = None
+        self.codegen = codegen
+        self.numba_compile = numba_compile
+        self._compiled = None       # cached `_Compiled` analysis; reset on mutation
+        self._compiled_fn = None    # generated function for `__call__`; reset on mutation
+        self._local = threading.local()     # per-thread slot buffer for `_interpret`
+
+    def _invalidate(self):
+        """
+        Drop all cached analysis and generated code after a mutation.
+        """
+        self._compiled = None
+        self._compiled_fn = None
+
+    def __getstate__(self) -> dict:
+        # the thread-local buffer and the exec-generated function cannot be
+        # pickled or copied; they are rebuilt on demand
+        state = self.__dict__.copy()
+        del state['_local']
+        state['_compiled'] = None
+        state['_compiled_fn'] = None
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._local = threading.local()
+
+    @property
+    def adjacency(self) -> dict[Vertex, list[type[None] | list[tuple[Vertex, str]]]]:
+        adjacency = {vertex: [None] * len(vertex) for vertex in self.vertices}
+        for src, idx, dst, kwd in zip(self._edge_src, self._edge_src_idx,
+                                      self._edge_dst, self._edge_kwd):
+            outs = adjacency[self.vertices[src]]
+            if outs[idx] is None:
+                outs[idx] = []
+            outs[idx].append((self.vertices[dst], kwd))
+        return adjacency
+
+    @property
+    def input_order(self) -> tuple[type]:
+        return self._input_order
+
+    @input_order.setter
+    def input_order(self, order: tuple[type]):
+        self._input_order = order
+        self._invalidate()
+
+    @property
+    def output_order(self) -> tuple[type]:
+        return self._output_order
+
+    @output_order.setter
+    def output_order(self, order: tuple[type]):
+        self._output_order = order
+        self._invalidate()
     
     def add(self, new: Vertex) -> Vertex:
         """
@@ -202,9 +425,17 @@ class FuncGraph:
         Vertex
             The added vertex.
         """
-        self.vertices.add(new)
-        self.adjacency[new] = [None] * len(new)
-        self.argdeps[new] = {k: None for k in new.inp_type}
+        if new in self._vid:
+            raise ValueError(f"{new} is already in the graph")
+        self._vid[new] = len(self.vertices)
+        self._ord.append(len(self.vertices))
+        self._succ.append([])
+        self.vertices.append(new)
+        self._out_base.append(len(self._out_count))
+        self._out_count.extend([0] * len(new))
+        self._open_outs.append(len(new))
+        self.argdeps[new] = dict.fromkeys(new.inp_names)
+        self._invalidate()
         return new
     
     def feed(self, src: Vertex, idx: int, dst: Vertex, kwd: str):
@@ -221,89 +452,136 @@ class FuncGraph:
             The destination vertex.
         kwd : str
             The keyword of the input to the destination vertex.
+
+        Raises
+        ------
+        ValueError
+            If the new edge would make the graph cyclic; the graph is left
+            unchanged in that case.
         """
-        if self.adjacency[src][idx] is not None:
-            self.adjacency[src][idx].append((dst, kwd))
-        else:
-            self.adjacency[src][idx] = [(dst, kwd)]
+        if not 0 <= idx < len(src):
+            raise IndexError(f"{src} has no output {idx}")
+        s, d = self._vid[src], self._vid[dst]
+        self._reorder(s, d)
+        self._succ[s].append(d)
+        self._edge_src.append(s)
+        self._edge_src_idx.append(idx)
+        self._edge_dst.append(d)
+        self._edge_kwd.append(kwd)
+        out = self._out_base[s] + idx
+        if self._out_count[out] == 0:
+            self._open_outs[s] -= 1
+        self._out_count[out] += 1
         self.argdeps[dst][kwd] = (src, idx)
+        self._invalidate()
     
-    def _get_topo_order(self) -> tuple[list[Vertex], Vertex]:
+    def _reorder(self, src: int, dst: int):
         """
-        Compute a topological order of the function graph.
+        Restore the topological order `_ord` before an edge `src -> dst` is
+        inserted, following Pearce and Kelly (2006). Only the vertices whose
+        order lies between `dst` and `src` can be affected: those reachable
+        from `dst` are moved after those reaching `src`, reusing the same
+        positions.
 
-        Returns
-        -------
-        topo_order : list[Vertex]
-            A list of vertices in topological order.
-        out : Vertex
-            The output vertex of the graph (highest topological
-            order with output).
-        """
-       
-        def dfs(vertex: Vertex, visited: set[Vertex], topo_order: list[Vertex]):
-            """
-            Perform a depth-first search on the reversed graph, to find the
-            topological order of the graph through post-order. This does not
-            take into account sink nodes, and checks for cycles in the graph.
-
-            Parameters
-            ----------
-            vertex : Vertex
-                The current vertex to search.
-            visited : set[Vertex]
-                Set of visited vertices.
-            topo_order : list[Vertex]
-                List of vertices in topological order.
-            """
-            visited.add(vertex)
-            recursing.add(vertex)
-            for _, into in self.argdeps[vertex].items():   # run on reverse graph
+        Parameters
+        ----------
+        src : int
+            The vid of the source vertex of the new edge.
+        dst : int
+            The vid of the destination vertex of the new edge.
+
+        Raises
+        ------
+        ValueError
+            If `src` is reachable from `dst`, i.e. the edge closes a cycle.
+        """
+        ord_ = self._ord
+        lb, ub = ord_[dst], ord_[src]
+        if lb > ub:
+            return
+        if src == dst:
+            raise ValueError("Cyclic graph")
+
+        # forward search from dst, within the affected region
+        forward = [dst]
+        seen = {dst}
+        stack = [dst]
+        while stack:
+            for w in self._succ[stack.pop()]:
+                if w == src:
+                    raise ValueError("Cyclic graph")
+                if w not in seen and ord_[w] < ub:
+                    seen.add(w)
+                    forward.append(w)
+                    stack.append(w)
+
+        # backward search from src, within the affected region
+        backward = [src]
+        seen = {src}
+        stack = [src]
+        while stack:
+            for into in self.argdeps[self.vertices[stack.pop()]].values():
                 if into is None:
                     continue
-                dst, _ = into
-                if dst in recursing:                       # back edge
-                    raise ValueError("Cyclic graph")
-                if dst not in visited:
-                    dfs(dst, visited, topo_order)
-            if len(self.adjacency[vertex]) > 0:            # non-sink vertex
-                topo_order.append(vertex)
-            recursing.remove(vertex)
-
-        visited = set()
-        recursing = set()
-        topo_order = []
-        for vertex in self.vertices:
-            if vertex not in visited:
-                dfs(vertex, visited, topo_order)
-
-        return topo_order
-    
-    def _get_out_indices(self, out: Vertex) -> list[int]:
+                w = self._vid[into[0]]
+                if w not in seen and ord_[w] > lb:
+                    seen.add(w)
+                    backward.append(w)
+                    stack.append(w)
+
+        backward.sort(key=ord_.__getitem__)
+        forward.sort(key=ord_.__getitem__)
+        moved = backward + forward
+        for w, i in zip(moved, sorted(ord_[w] for w in moved)):
+            ord_[w] = i
+
+    def _traverse(
+        self
+    ) -> tuple[list[Vertex], list[tuple[Vertex, str, type]], list[tuple[Vertex, int]]]:
         """
-        Get a list of output indices of the given vertex `out` that have no
-        destination vertex (i.e., the output is not connected to any input of
-        any other vertex).
-
-        Parameters
-        ----------
-        out : Vertex
-            The vertex to get the output indices for.
+        Walk the function graph once in topological order, collecting
+        everything `_compile` needs along the way. The order is the one `feed`
+        maintains incrementally in `_ord`, so no sort or cycle check is
+        needed here. Sink vertices are left out of the order.
 
         Returns
         -------
-        out_idx : list[int]
-            A list of output indices of `out` that are not connected to any
-            input of any other vertex.
-        """
-        out_idx = []
-        for e, into in enumerate(self.adjacency[out]):
-            if into is None:
-                out_idx.append(e)
-        return out_idx
+        topo_order : list[Vertex]
+            A list of vertices in topological order.
+        free_inputs : list[tuple[Vertex, str, type]]
+            The `(vertex, keyword, type)` inputs not fed by any other vertex,
+            in topological order.
+        open_outputs : list[tuple[Vertex, int]]
+            The `(vertex, output_idx)` outputs not fed to any other vertex, in
+            topological order.
+        """
+        by_position = [None] * len(self.vertices)
+        for vertex, position in zip(self.vertices, self._ord):
+            by_position[position] = vertex
+
+        topo_order = []
+        free_inputs = []
+        open_outputs = []
+
+        for vertex in by_position:
+            deps = self.argdeps[vertex]
+            for kwd, typ in zip(vertex.inp_names, vertex.inp_types):
+                if deps[kwd] is None:
+                    free_inputs.append((vertex, kwd, typ))
+            if len(vertex) > 0:                            # non-sink vertex
+                topo_order.append(vertex)
+                v = self._vid[vertex]
+                if self._open_outs[v] > 0:
+                    base = self._out_base[v]
+                    for e, count in enumerate(self._out_count[base:base + len(vertex)]):
+                        if count == 0:
+                            open_outputs.append((vertex, e))
+
+        return topo_order, free_inputs, open_outputs
     
     def _get_outputs(
         self,
+        open_outputs: list[tuple[Vertex, int]],
         type_ordering: tuple[type] = None
     ) -> tuple[tuple[type], tuple[tuple[Vertex, int]]]:
         """
@@ -311,6 +589,8 @@ class FuncGraph:
 
         Parameters
         ----------
+        open_outputs : list[tuple[Vertex, int]]
+            The unconnected `(vertex, output_idx)` pairs, as found by `_traverse`.
         type_ordering : tuple[type], optional
             A tuple of types to order the outputs by.
 
@@ -322,22 +602,11 @@ class FuncGraph:
             A list of tuples, where each tuple contains the output vertex and
             the index of the output type.
         """
-        outs = []
-
-        for vertex in self.vertices:
-            if ( not isinstance(vertex, SinkVertex) and
-                 None in self.adjacency[vertex] ):  # has an uncaught output
-                outs.append(vertex)
-        if len(outs) == 0:
+        if len(open_outputs) == 0:
             raise ValueError("Graph does not have an output vertex.")
         
-        outs_idx = [self._get_out_indices(o) for o in outs]
-        
-        out_type = []
-        out_map = []
-        for o, o_i in zip(outs, outs_idx):
-            out_type.extend([o.out_type[j] for j in o_i])
-            out_map.extend([(o, j) for j in o_i])
+        out_type = [o.out_type[j] for o, j in open_outputs]
+        out_map = list(open_outputs)
         
         # if a preferred ordering is provided, reflect that in the output
         if type_ordering is None:
@@ -345,17 +614,11 @@ class FuncGraph:
         
         if ( type_ordering is not None and
              Counter(out_type) == Counter(type_ordering) ):
-            used = set()
-            new_out_type = []
-            new_out_map = []
-            for typ in type_ordering:
-                for e, (o, o_i) in enumerate(zip(out_type, out_map)):
-                    if o == typ and e not in used:
-                        used.add(e)
-                        new_out_type.append(o)
-                        new_out_map.append(o_i)
-                        break
-            out_type, out_map = new_out_type, new_out_map
+            buckets = {}                # type: outputs of that type, in order
+            for o, o_i in zip(out_type, out_map):
+                buckets.setdefault(o, deque()).append(o_i)
+            out_type = type_ordering
+            out_map = [buckets[typ].popleft() for typ in type_ordering]
 
         return tuple(out_type), tuple(out_map)
     
@@ -372,24 +635,26 @@ class FuncGraph:
         out_type : tuple[type]
             The output type of this graph.
         """
-        out_type, _ = self._get_outputs()
-        return tuple(out_type)
+        return self._compile().out_type
     
     def _get_arguments(
         self,
+        free_inputs: list[tuple[Vertex, str, type]],
         type_ordering: tuple[type] = None
     ) -> tuple[dict[str, type], dict[tuple[Vertex, str], str]]:
         """
         Get a dictionary of input types and a dictionary mapping argument names to their corresponding
         keyword argument names in the input dictionary.
 
-        The input dictionary is constructed by iterating through all vertices in the graph and
+        The input dictionary is constructed by iterating through the free inputs of the graph and
         accumulating their input types into a single dictionary. If an input type is encountered
         multiple times, a counter is used to disambiguate the names by appending a number to the
         argument name.
 
         Parameters
         ----------
+        free_inputs : list[tuple[Vertex, str, type]]
+            The unconnected `(vertex, keyword, type)` inputs, as found by `_traverse`.
         type_ordering : tuple[type], optional
             A tuple of types to order the arguments by.
 
@@ -403,16 +668,11 @@ class FuncGraph:
         counters = {}
         inp_type = {}
         arg_map = {}
-        for vertex in self.vertices:
-            for kwd in vertex.inp_type:
-                if self.argdeps[vertex][kwd] is None:
-                    if kwd in counters:
-                        counters[kwd] += 1
-                    else:
-                        counters[kwd] = 0
-                    arg_name = f'{kwd}{counters[kwd]}'
-                    inp_type[arg_name] = vertex.inp_type[kwd]
-                    arg_map[(vertex, kwd)] = arg_name
+        for vertex, kwd, typ in free_inputs:
+            n = counters[kwd] = counters.get(kwd, -1) + 1
+            arg_name = f'{kwd}{n}'
+            inp_type[arg_name] = typ
+            arg_map[(vertex, kwd)] = arg_name
         
         # if a preferred ordering is provided, reflect that in the
         # insertion order of the input dictionary
@@ -421,15 +681,10 @@ class FuncGraph:
         
         if ( (type_ordering is not None) and 
              (Counter(inp_type.values()) == Counter(type_ordering)) ):
-            new_inp_type = {}
-            used = set()
-            for typ in type_ordering:
-                for k, v in inp_type.items():
-                    if v == typ and k not in used:
-                        used.add(k)
-                        new_inp_type[k] = v
-                        break
-            inp_type = new_inp_type
+            buckets = {}                # type: argument names of that type, in order
+            for k, v in inp_type.items():
+                buckets.setdefault(v, deque()).append(k)
+            inp_type = {buckets[typ].popleft(): typ for typ in type_ordering}
 
         return inp_type, arg_map
     
@@ -443,21 +698,80 @@ class FuncGraph:
             A dictionary where each key is an argument name and the value is
             the corresponding type of the argument.
         """
-        inp_type, _ = self._get_arguments()
-        return inp_type
+        return dict(self._compile().inp_type)
+    
+    def _compile(self) -> _Compiled:
+        """
+        Analyse the graph structure, or return the cached analysis.
+
+        The topological order, argument mapping and output mapping only change
+        when the graph is mutated (through `add`, `feed`, or by setting
+        `input_order` / `output_order`), all of which reset the cache. The
+        graph itself is traversed once; everything after that works off the
+        lists `_traverse` returns.
+
+        Returns
+        -------
+        _Compiled
+            The analysis of the graph in its current state.
+        """
+        if self._compiled is not None:
+            return self._compiled
+
+        order, free_inputs, open_outputs = self._traverse()
+        inp_type, arg_map = self._get_arguments(free_inputs)
+        out_type, out_map = self._get_outputs(open_outputs)
+
+        # the graph arguments take the first slots, in `inp_type` order; every
+        # vertex output follows in topological order, so that the outputs of a
+        # vertex occupy consecutive slots
+        arg_slot = {name: e for e, name in enumerate(inp_type)}
+        first_slot = {}
+        n_slots = len(arg_slot)
+        for vertex in order:
+            first_slot[vertex] = n_slots
+            n_slots += len(vertex)
+        out_slots = tuple(first_slot[o] + idx for o, idx in out_map)
+
+        # resolve the slot every input of every vertex is read from, in the
+        # order of its positional parameters
+        plan = []
+        for vertex in order:
+            ins = []
+            for kwd in vertex.inp_names:
+                arg_name = arg_map.get((vertex, kwd))
+                if arg_name is not None:
+                    ins.append(arg_slot[arg_name])
+                else:
+                    src, idx = self.argdeps[vertex][kwd]
+                    ins.append(first_slot[src] + idx)
+
+            fn = vertex
+            if isinstance(vertex, FuncVertex):
+                fn = vertex._invoke
+                kwds = vertex.inp_names
+                if _positional_names(vertex.func)[:len(kwds)] != kwds:
+                    fn = functools.partial(_call_by_keyword, fn, kwds)
+
+            base = first_slot[vertex]
+            plan.append((vertex, fn, tuple(ins), base, base + len(vertex)))
+
+        self._compiled = _Compiled(
+            order, inp_type, arg_map, out_type, out_map,
+            first_slot, n_slots, out_slots, tuple(plan)
+        )
+        return self._compiled
         
     def __len__(self) -> int:
         return len(self.vertices)
     
     def __str__(self) -> str:
-        inp_type = self.get_inp_type()
-        return f'{self.name}({", ".join(k for k in inp_type)})'
+        return f'{self.name}({", ".join(self._compile().inp_type)})'
     
     def __repr__(self) -> str:
-        inp_type = self.get_inp_type()
-        out_type = self.get_out_type()
-        _i = ", ".join(f"{k}: {t}" for k, t in inp_type.items())
-        return f'{self.name}({_i}) -> {out_type}'
+        c = self._compile()
+        _i = ", ".join(f"{k}: {t}" for k, t in c.inp_type.items())
+        return f'{self.name}({_i}) -> {c.out_type}'
     
     def straight_line(self) -> str:
         """
@@ -472,20 +786,19 @@ class FuncGraph:
         intermediates = {}      # (vertex, kwd): str
         counter = 0
 
-        inp_type, arg_map = self._get_arguments()
-        out_type, out_map = self._get_outputs()
-        order = self._get_topo_order()
+        order, inp_type, arg_map, out_type, out_map, *_ = self._compile()
 
         prog += f'> INPUT ({", ".join(f"${k}: {inp_type[k]}" for k in inp_type)})\n'
 
         for vertex in order:
             current_kwargs = {}
-            for kwd in vertex.inp_type:
-                if (vertex, kwd) in arg_map:
-                    current_kwargs[kwd] = '$'+arg_map[(vertex, kwd)]
-                elif self.argdeps[vertex][kwd] in intermediates:
-                    current_kwargs[kwd] = intermediates[self.argdeps[vertex][kwd]]
-            computation = ", ".join(f"{k}: {vertex.inp_type[k]} = {v}" for k, v in current_kwargs.items())
+            for kwd, typ in zip(vertex.inp_names, vertex.inp_types):
+                arg_name = arg_map.get((vertex, kwd))
+                if arg_name is not None:
+                    current_kwargs[kwd] = (typ, '$'+arg_name)
+                elif (var := intermediates.get(self.argdeps[vertex][kwd])) is not None:
+                    current_kwargs[kwd] = (typ, var)
+            computation = ", ".join(f"{k}: {t} = {v}" for k, (t, v) in current_kwargs.items())
             
             names = []
             for idx in range(len(vertex)):
@@ -499,29 +812,205 @@ class FuncGraph:
         prog += '> RETURN ' + ", ".join(returns)
         return prog
 
+    def _numba_signature(self):
+        """
+        Get the `numba.njit` signature of this graph, if it can be jitted.
+
+        Returns
+        -------
+        numba.core.typing.templates.Signature | None
+            The signature built from the input and output types of the graph,
+            or None if numba is unavailable, some function vertex does not
+            wrap a Python function or numba dispatcher, or some type has no
+            numba equivalent.
+        """
+        numba = _import_numba()
+        if numba is None:
+            return None
+        NUMBA_TYPES = {
+            int: numba.int64,
+            float: numba.float64,
+            bool: numba.boolean
+        }
+        order, inp_type, _, out_type, *_ = self._compile()
+        for vertex in order:
+            if isinstance(vertex, FuncVertex):
+                if not isinstance(getattr(vertex.func, 'py_func', vertex.func),
+                                  types.FunctionType):
+                    return None
+            elif isinstance(vertex, ConstVertex):
+                if type(vertex.value) not in NUMBA_TYPES:
+                    return None
+            elif not isinstance(vertex, OutVertex):
+                return None
+        if not all(t in NUMBA_TYPES for t in (*inp_type.values(), *out_type)):
+            return None
+        return numba.types.Tuple([NUMBA_TYPES[t] for t in out_type])(
+            *(NUMBA_TYPES[t] for t in inp_type.values())
+        )
+
+    def _codegen(self) -> types.FunctionType:
+        """
+        Compile the function graph into a straight-line function.
+
+        If `numba_compile` is set and `_numba_signature` allows it, the graph
+        is compiled with `numba.njit`, falling back to plain Python if numba
+        fails to type it. The compiled graph follows numba's semantics; see
+        `numba_compile` in `__init__`.
+
+        Returns
+        -------
+        types.FunctionType
+            A function taking the graph inputs (positionally or by keyword)
+            and returning the tuple of graph outputs.
+        """
+        signature = self._numba_signature() if self.numba_compile else None
+        if signature is not None:
+            numba = _import_numba()
+            try:
+                return numba.njit(signature)(self._render(native=True))
+            except numba.core.errors.NumbaError:
+                pass
+        return self._render(native=False)
+
+    def _render(self, native: bool = False) -> types.FunctionType:
+        """
+        Render the function graph as Python source and execute it.
+
+        Every vertex is bound to a global `_f{i}` of the generated module and
+        every intermediate value to a local `_v{i}`, so that a call runs the
+        vertices in topological order without any graph bookkeeping. Output
+        vertices become plain assignments, and single-output functions are
+        called directly instead of through their tuple-wrapping `_invoke`.
+
+        Parameters
+        ----------
+        native : bool, optional
+            Whether to call the functions of function vertices through
+            `numba.njit` and inline constant values as literals, so that the
+            source only refers to objects numba can compile.
+
+        Returns
+        -------
+        types.FunctionType
+            The generated function.
+        """
+        c = self._compile()
+
+        namespace = {}
+        body = []
+        local = [*c.inp_type, *(f'_v{slot}' for slot in range(len(c.inp_type), c.n_slots))]
+
+        for e, (vertex, call, ins, start, end) in enumerate(c.plan):
+            fn = f'_f{e}'
+            names = local[start:end]
+            args = [local[slot] for slot in ins]
+
+            if isinstance(vertex, OutVertex):
+                body.append(f'    {names[0]} = {args[0]}')
+            elif isinstance(vertex, ConstVertex):
+                if native:
+                    body.append(f'    {names[0]} = {vertex.value!r}')
+                else:
+                    namespace[fn] = vertex.value
+                    body.append(f'    {names[0]} = {fn}')
+            elif native:
+                namespace[fn] = _jitted(vertex.func)
+                unpack = '' if vertex.single else ','
+                call = ", ".join(f'{k}={v}' for k, v in zip(vertex.inp_names, args))
+                body.append(f'    {", ".join(names)}{unpack} = {fn}({call})')
+            elif isinstance(vertex, FuncVertex) and vertex.single and call is vertex._invoke:
+                # call the function itself, not its tuple-wrapping `_invoke`
+                namespace[fn] = getattr(vertex.func, 'py_func', vertex.func)
+                body.append(f'    {names[0]} = {fn}({", ".join(args)})')
+            else:
+                namespace[fn] = call
+                body.append(f'    {", ".join(names)}, = {fn}({", ".join(args)})')
+
+        returns = "".join(f'{local[slot]}, ' for slot in c.out_slots)
+        src = (f'def _graph_fn({", ".join(c.inp_type)}):\n' +
+               ''.join(f'{line}\n' for line in body) +
+               f'    return ({returns})\n')
+
+        exec(compile(src, f'<{self.name}>', 'exec'), namespace)
+        fn = namespace['_graph_fn']
+        fn.__name__ = fn.__qualname__ = self.name
+        return fn
+
     def __call__(self, *args, **kwargs):
-        intermediates = {}      # (vertex, kwd): value
+        if not self.codegen:
+            return self._interpret(*args, **kwargs)
+        if self._compiled_fn is None:
+            self._compiled_fn = self._codegen()
+        return self._compiled_fn(*args, **kwargs)
 
-        inp_type, arg_map = self._get_arguments()
-        out_type, out_map = self._get_outputs()
-        order = self._get_topo_order()
+    def _interpret(self, *args, **kwargs):
+        """
+        Evaluate the function graph by walking it vertex by vertex.
+        """
+        c = self._compile()
+
+        n_args = len(c.inp_type)
+        if len(args) != n_args:             # bind the remaining arguments by name
+            names = tuple(c.inp_type)
+            if len(args) > n_args:
+                raise TypeError(f'{self.name}() takes {n_args} arguments but {len(args)} were given')
+            try:
+                args += tuple(kwargs[name] for name in names[len(args):])
+            except KeyError as e:
+                raise TypeError(f'{self.name}() missing argument {e}') from None
+
+        # reuse this thread's buffer; every slot is written before it is read
+        slots = getattr(self._local, 'slots', None)
+        if slots is None or len(slots) != c.n_slots:
+            slots = self._local.slots = [None] * c.n_slots
+        slots[:n_args] = args
+        for vertex, fn, ins, start, end in c.plan:
+            result = fn(*[slots[s] for s in ins])
+            if len(result) != end - start:      # would shift every later slot
+                raise ValueError(f'{vertex} returned {len(result)} values, expected {end - start}')
+            slots[start:end] = result
+
+        return tuple(slots[s] for s in c.out_slots)
+
+    def call_batch(self, inputs: list[tuple]) -> list[tuple]:
+        """
+        Evaluate the function graph on many inputs at once.
 
-        for name, value in zip(inp_type, args):
-            kwargs[name] = value
+        The graph is walked once for the whole batch: each vertex is mapped
+        over the columns of its inputs before moving on to the next vertex,
+        so the per-vertex dispatch is paid once per batch rather than once
+        per input.
 
-        for vertex in order:
-            current_kwargs = {}
-            for kwd in vertex.inp_type:
-                if (vertex, kwd) in arg_map:
-                    current_kwargs[kwd] = kwargs[arg_map[(vertex, kwd)]]
-                elif self.argdeps[vertex][kwd] is not None:
-                    current_kwargs[kwd] = intermediates[self.argdeps[vertex][kwd]]
-            result = vertex(**current_kwargs)
-            
-            for idx in range(len(vertex)):
-                intermediates[(vertex, idx)] = result[idx]
-        
-        return tuple(intermediates[o] for o in out_map)
+        Parameters
+        ----------
+        inputs : list[tuple]
+            A list of positional argument tuples, one per evaluation.
+
+        Returns
+        -------
+        list[tuple]
+            The output tuple of the graph for each input, in the same order.
+        """
+        c = self._compile()
+
+        n_args = len(c.inp_type)
+        for args in inputs:
+            if len(args) != n_args:
+                raise TypeError(f'{self.name}() takes {n_args} arguments but {len(args)} were given')
+        if not inputs:
+            return []
+
+        slots = [None] * c.n_slots          # slot: column of values across the batch
+        slots[:n_args] = zip(*inputs)
+        for _, fn, ins, start, end in c.plan:
+            if ins:
+                results = map(fn, *[slots[s] for s in ins])
+            else:
+                results = [fn()] * len(inputs)
+            slots[start:end] = zip(*results)
+
+        return list(zip(*[slots[s] for s in c.out_slots]))
 
 
 class RandomComposer:
@@ -536,11 +1025,25 @@ class RandomComposer:
         A dictionary of functions from the module.
     funcs_types : dict[str, tuple[Counter[type], Counter[type]]]
         A dictionary mapping function names to their input and output types.
+    funcs_sig : dict[str, tuple[dict[str, type], tuple[type], bool]]
+        A dictionary mapping function names to the result of `get_types`.
+    type_index : dict[type, int]
+        An index for every type used by the functions, in order of appearance.
+    funcs_vecs : dict[str, tuple[tuple[int], tuple[int]]]
+        A dictionary mapping function names to their input and output type
+        multiplicities, as dense vectors indexed by `type_index`.
+    funcs_masks : dict[str, tuple[int | None, int | None]]
+        A dictionary mapping function names to their input and output types
+        as bitmasks over `type_index`, or None where a type occurs twice.
     """
 
     module: types.ModuleType
     funcs: dict[str, types.FunctionType]
     funcs_types: dict[str, tuple[Counter[type], Counter[type]]]
+    funcs_sig: dict[str, tuple[dict[str, type], tuple[type], bool]]
+    type_index: dict[type, int]
+    funcs_vecs: dict[str, tuple[tuple[int], tuple[int]]]
+    funcs_masks: dict[str, tuple[int | None, int | None]]
 
     def __init__(self, module: types.ModuleType):
         """
@@ -555,30 +1058,75 @@ class RandomComposer:
         self.funcs = get_funcs(module)
 
         self.funcs_types = {}
-        for name, func in self.funcs.items():
-            inp_type, out_type, _ = get_types(func)
+        self.funcs_sig = precompute_types(self.funcs)
+        for name, (inp_type, out_type, _) in self.funcs_sig.items():
             self.funcs_types[name] = (
                 Counter(inp_type.values()),
                 Counter(out_type)
             )
 
+        self.type_index = {}
+        for fn_inp_set, fn_out_set in self.funcs_types.values():
+            for typ in (*fn_inp_set, *fn_out_set):
+                self.type_index.setdefault(typ, len(self.type_index))
+        self.funcs_vecs = {
+            name: (self._type_vector(fn_inp_set), self._type_vector(fn_out_set))
+            for name, (fn_inp_set, fn_out_set) in self.funcs_types.items()
+        }
+        self.funcs_masks = {
+            name: (_type_mask(fn_inp_vec), _type_mask(fn_out_vec))
+            for name, (fn_inp_vec, fn_out_vec) in self.funcs_vecs.items()
+        }
+
+    def _type_vector(self, type_set: Counter[type]) -> tuple[int]:
+        """
+        Convert a multiset of indexed types into a dense vector indexed by
+        `type_index`.
+        """
+        vec = [0] * len(self.type_index)
+        for typ, count in type_set.items():
+            vec[self.type_index[typ]] += count
+        return tuple(vec)
+
     def _find_resemblance_scores(
         self,
-        inp_set: Counter[type] = None,
-        out_set: Counter[type] = None,
+        inp_vec: list[int] = None,
+        out_vec: list[int] = None,
         inp_weighing: float = 2.0,
         temp: float = 0.7
     ):
-        resemblance = lambda x, y : (x & y).total() / (x | y).total()
+        # Jaccard similarity of multisets: the sum of elementwise minima over
+        # the sum of elementwise maxima; the query vectors may be longer than
+        # `type_index`, but types past its end only ever appear in the query,
+        # so they add to the maxima alone
+        n_types = len(self.type_index)
+        resemblance = lambda x, extra, y : sum(map(min, x, y)) / (sum(map(max, x, y)) + extra)
+        # when neither side repeats a type, the same score is the Jaccard
+        # similarity of plain sets, which bitmasks give with two popcounts
+        set_resemblance = lambda x, y : (x & y).bit_count() / (x | y).bit_count()
+        if inp_vec is not None:
+            inp_extra = sum(inp_vec[n_types:])
+            inp_mask = _type_mask(inp_vec)
+        if out_vec is not None:
+            out_extra = sum(out_vec[n_types:])
+            out_mask = _type_mask(out_vec)
         names = []
         scores = []
 
-        for name, (fn_inp_set, fn_out_set) in self.funcs_types.items():
+        for (name, (fn_inp_vec, fn_out_vec)), (fn_inp_mask, fn_out_mask) in zip(
+            self.funcs_vecs.items(), self.funcs_masks.values()
+        ):
             score = 0
-            if inp_set is not None:
-                score += resemblance(inp_set, fn_inp_set) * inp_weighing
-            if out_set is not None:
-                score += resemblance(out_set, fn_out_set)
+            if inp_vec is not None:
+                if inp_mask is not None and fn_inp_mask is not None:
+                    score += set_resemblance(inp_mask, fn_inp_mask) * inp_weighing
+                else:
+                    score += resemblance(inp_vec, inp_extra, fn_inp_vec) * inp_weighing
+            if out_vec is not None:
+                if out_mask is not None and fn_out_mask is not None:
+                    score += set_resemblance(out_mask, fn_out_mask)
+                else:
+                    score += resemblance(out_vec, out_extra, fn_out_vec)
             
             if score > 0:
                 names.append(name)
@@ -594,39 +1142,56 @@ class RandomComposer:
         p_branching: float = 0.2,
         n_lookahead: int = 2,
         low_temp: float = 0.3,
-        inp_weighing: float = 2.0
+        inp_weighing: float = 2.0,
+        rng: random.Random | None = None
     ) -> FuncGraph:
+        if rng is None:
+            rng = random.Random()
         
-        goal = Counter(input_type)
-        frontier = Counter(output_type)
-        depth_queues = {typ: [] for typ in frontier}
+        # the goal and frontier multisets of types are dense counts indexed
+        # by `type_index`, extended with the types only the signature uses
+        type_index = dict(self.type_index)
+        for typ in (*input_type, *output_type):
+            type_index.setdefault(typ, len(type_index))
+
+        goal = [0] * len(type_index)
+        for typ in input_type:
+            goal[type_index[typ]] += 1
+        frontier = [0] * len(type_index)
+        depth_queues = [[] for _ in type_index]
         for typ in output_type:              # use input_type here to maintain quantity
+            ti = type_index[typ]
+            frontier[ti] += 1
             heapq.heappush(
-                depth_queues[typ],
+                depth_queues[ti],
                 (0, None, None)             # (depth, vertex, kwd) for lexicographical ordering by depth
             )
 
         depth = 0
         outputs_hit = 0
         graph = FuncGraph()
+        # one sink per type absorbs every unused output of that type: a sink
+        # is never read from, so only its edges matter, not which of them
+        # `argdeps` records
+        sinks = [None] * len(type_index)
 
         while frontier != goal or outputs_hit < len(output_type):
             
             # compute type signature resemblances
             kwargs = {
-                'out_set': frontier
+                'out_vec': frontier
             }
             if depth >= max_depth - n_lookahead:
-                kwargs['inp_set'] = goal
+                kwargs['inp_vec'] = goal
                 kwargs['inp_weighing'] = inp_weighing
             if depth == 0 or depth >= max_depth - n_lookahead:
                 kwargs['temp'] = low_temp   # more predictability at start and end
             names, scores = self._find_resemblance_scores(**kwargs)
 
             # choose a function to add
-            choice = random.choices(names, weights=scores, k=1)[0]
+            choice = rng.choices(names, weights=scores, k=1)[0]
             func = self.funcs[choice]
-            fn_inp_type, fn_out_type, _ = get_types(func)
+            fn_inp_type, fn_out_type, _ = self.funcs_sig[choice]
             fn_depth = 0
 
             # add function to graph
@@ -635,13 +1200,12 @@ class RandomComposer:
 
             # update frontier and depth_queues with function output types
             for idx, typ in enumerate(fn_out_type):
+                ti = type_index[typ]
                 used = False
-                while typ in frontier:     # feed useful outputs to earlier stuff first
+                while frontier[ti] > 0:     # feed useful outputs to earlier stuff first
                     used = True
-                    frontier[typ] -= 1
-                    if frontier[typ] == 0:
-                        del frontier[typ]
-                    (_d, dst, kwd) = heapq.heappop(depth_queues[typ])
+                    frontier[ti] -= 1
+                    (_d, dst, kwd) = heapq.heappop(depth_queues[ti])
 
                     fn_depth = max(fn_depth, _d + 1)
                     if dst is None:
@@ -651,20 +1215,20 @@ class RandomComposer:
                         graph.feed(vertex, idx, _o, OUT_KWD)
                     else:
                         graph.feed(vertex, idx, dst, kwd)
-                    if random.random() > p_branching:   # allow same output to be used multiple times
+                    if rng.random() > p_branching:   # allow same output to be used multiple times
                         break
                 
                 if not used:             # sink unused outputs
-                    dst = SinkVertex(typ)
-                    graph.add(dst)
+                    dst = sinks[ti]
+                    if dst is None:
+                        dst = sinks[ti] = graph.add(SinkVertex(typ))
                     graph.feed(vertex, idx, dst, SINK_KWD)
             
             # update frontier and depth_queues with function input types
             for kwd, typ in fn_inp_type.items():
-                if typ not in depth_queues:
-                    depth_queues[typ] = []
-                frontier.update([typ])
-                heapq.heappush(depth_queues[typ], (fn_depth, vertex, kwd))
+                ti = type_index[typ]
+                frontier[ti] += 1
+                heapq.heappush(depth_queues[ti], (fn_depth, vertex, kwd))
             
             # update depth
             depth = max(depth, fn_depth)
@@ -673,19 +1237,16 @@ class RandomComposer:
             
             # apply constants to fit goal when nearing the end
             if depth >= max_depth:
-                residues = frontier - goal
                 if typ not in DTYPE_GENERATORS:
                     continue
-                while typ in residues:
-                    residues[typ] -= 1
-                    if residues[typ] == 0:
-                        del residues[typ]
-                    frontier[typ] -= 1
-                    if frontier[typ] == 0:
-                        del frontier[typ]
-                    (_d, dst, kwd) = heapq.heappop(depth_queues[typ])
+                ti = type_index[typ]
+                residues = frontier[ti] - goal[ti]
+                while residues > 0:
+                    residues -= 1
+                    frontier[ti] -= 1
+                    (_d, dst, kwd) = heapq.heappop(depth_queues[ti])
                     
-                    v = ConstVertex(DTYPE_GENERATORS[typ]())
+                    v = ConstVertex(DTYPE_GENERATORS[typ](rng))
                     graph.add(v)
                     if dst is None:
                         outputs_hit += 1
@@ -700,13 +1261,16 @@ class RandomComposer:
         return graph
     
     def sample(self, input_type, output_type, max_depth=4, seed=0):
-        random.seed(seed)
+        # a private generator leaves the global random state alone and keeps
+        # concurrent samples from interleaving their draws
+        rng = random.Random(seed)
         
         while True:
             graph = self._compose_func(
                 input_type,
                 output_type,
-                max_depth
+                max_depth,
+                rng=rng
             )
             if graph is not None:
                 return graph
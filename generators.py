@@ -1,14 +1,17 @@
 import random
 
-def random_string() -> str:
-    return ''.join(random.choice('abcdefghijklmnopqrstuvwxyz')
-                   for _ in range(random.randint(1, 5)))
+def random_string(rng: random.Random | None = None) -> str:
+    rng = rng or random
+    return ''.join(rng.choice('abcdefghijklmnopqrstuvwxyz')
+                   for _ in range(rng.randint(1, 5)))
 
-def random_int() -> int:
-    return random.randint(0, 5)
+def random_int(rng: random.Random | None = None) -> int:
+    rng = rng or random
+    return rng.randint(0, 5)
 
-def random_float() -> float:
-    return random.uniform(-2.0, 2.0)
+def random_float(rng: random.Random | None = None) -> float:
+    rng = rng or random
+    return rng.uniform(-2.0, 2.0)
 
 
 DTYPE_GENERATORS = {
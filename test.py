@@ -35,3 +35,10 @@ print(g.straight_line(), '\n')
 for _ in range(10):
     inp = tuple(generators.DTYPE_GENERATORS[typ]() for typ in inp_type)
     print(inp, '->', g(*inp))
+
+print('\n\nBATCH\n\n')
+
+batch = [tuple(generators.DTYPE_GENERATORS[typ]() for typ in inp_type) for _ in range(10)]
+assert g.call_batch([]) == []
+assert g.call_batch(batch) == [g(*inp) for inp in batch]
+print(len(batch), 'inputs evaluated in one batch')
@@ -1,6 +1,9 @@
 import math
 import types
+import functools
 from typing import (
+    Annotated,
+    ForwardRef,
     get_origin,
     get_args,
     get_type_hints
@@ -18,6 +21,10 @@ def softmax(
     """
     Compute the softmax of a list of numbers.
 
+    The maximum is subtracted before exponentiating, which leaves the result
+    unchanged but keeps `math.exp` from overflowing on large inputs or low
+    temperatures.
+
     Parameters
     ----------
     arr
@@ -28,15 +35,22 @@ def softmax(
     softmax
         The softmax of the list of numbers.
     """
-    exp_arr = [math.exp(x / temp) for x in arr]
-    s = sum(exp_arr)
-    return [x / s for x in exp_arr]
+    if not arr:
+        return []
+    m = max(arr)
+    if temp == 1.0:
+        exp_arr = [math.exp(x - m) for x in arr]
+    else:
+        inv_temp = 1.0 / temp
+        exp_arr = [math.exp((x - m) * inv_temp) for x in arr]
+    inv_s = 1.0 / sum(exp_arr)
+    return [x * inv_s for x in exp_arr]
 
 
 def argmax(arr: list[float]) -> int:
     """
-    Get the index of the maximum element in a list of 
-    NON-NEGATIVE floats.
+    Get the index of the maximum element in a list of floats. Ties go to
+    the first maximum.
 
     Parameters
     ----------
@@ -46,23 +60,21 @@ def argmax(arr: list[float]) -> int:
     Returns
     -------
     max_idx
-        The index of the maximum element in the list.
+        The index of the maximum element in the list, or None if the list
+        is empty.
 
     """
-    max_itm = -1
-    max_idx = None
-    for e, v in enumerate(arr):
-        if v > max_itm:
-            max_itm = v
-            max_idx = e
-    return max_idx
+    if not arr:
+        return None
+    return arr.index(max(arr))
 
 
 def get_funcs(
     module: types.ModuleType
 ) -> dict[str, types.FunctionType]:
     """
-    Get all functions from a module.
+    Get all functions from a module, including functions compiled by numba
+    (recognised by the plain Python function in their `py_func`).
 
     Parameters
     ----------
@@ -76,9 +88,8 @@ def get_funcs(
         the function and the value is the function object itself.
     """
     func_dict = {}
-    for name in dir(module):
-        obj = getattr(module, name)
-        if isinstance(obj, types.FunctionType):
+    for name, obj in sorted(vars(module).items()):   # sorted, as `dir` was
+        if isinstance(getattr(obj, 'py_func', obj), types.FunctionType):
             func_dict[name] = obj
     return func_dict
 
@@ -101,16 +112,30 @@ def returns_single(
     single
         True if the type hint returns a single value, False otherwise.
     """
-    return not  (   len(get_args(dtype)) > 0
-                    and 
-                    tuple in (dtype, get_origin(dtype))   )
+    return get_origin(dtype) is not tuple or not get_args(dtype)
+
 
+def _is_resolved(hint) -> bool:
+    """
+    Check that a type hint holds no string or forward reference, `Annotated`
+    wrapper or bare None, at any depth, i.e. that `get_type_hints` would
+    return it as is.
+    """
+    if hint is None or isinstance(hint, (str, ForwardRef)):
+        return False
+    if get_origin(hint) is Annotated:
+        return False
+    return all(_is_resolved(arg) for arg in get_args(hint))
 
+
+@functools.lru_cache(maxsize=None)
 def get_types(
     func: types.FunctionType
 ) -> tuple[dict[str, type], type | tuple[type], bool]:
     """
-    Get type hints from a function.
+    Get type hints from a function, memoized by function object so that each
+    function is only introspected once. The returned dictionary is shared
+    between calls and must not be mutated.
 
     Parameters
     ----------
@@ -127,7 +152,17 @@ def get_types(
     single
         A boolean for whether the original function returns a single value or a tuple.
     """
-    inp_type_dict = get_type_hints(func)
+    # a None default makes `get_type_hints` wrap the hint in Optional on
+    # Python 3.10, so leave such functions to it as well
+    annotations = getattr(func, '__annotations__', {})
+    plain = getattr(func, 'py_func', func)
+    defaults = (*(getattr(plain, '__defaults__', None) or ()),
+                *(getattr(plain, '__kwdefaults__', None) or {}).values())
+    if ( None not in defaults and
+         all(_is_resolved(hint) for hint in annotations.values()) ):
+        inp_type_dict = dict(annotations)   # nothing for `get_type_hints` to evaluate
+    else:
+        inp_type_dict = get_type_hints(func)
     out_type = inp_type_dict.pop('return')
 
     if (single := returns_single(out_type)):
@@ -136,3 +171,23 @@ def get_types(
         out_type = get_args(out_type)
 
     return inp_type_dict, out_type, single
+
+
+def precompute_types(
+    func_dict: dict[str, types.FunctionType]
+) -> dict[str, tuple[dict[str, type], tuple[type], bool]]:
+    """
+    Get type hints from every function in a dictionary, as returned by
+    `get_funcs`, so that a fixed set of functions is introspected up front.
+
+    Parameters
+    ----------
+    func_dict
+        A dictionary of {name: function object}.
+
+    Returns
+    -------
+    types_dict
+        A dictionary of {name: get_types(function)} for each function.
+    """
+    return {name: get_types(func) for name, func in func_dict.items()}